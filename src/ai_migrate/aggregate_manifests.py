@@ -1,4 +1,5 @@
 import csv
+from pathlib import Path
 
 from ai_migrate.manifest import Manifest
 
@@ -8,7 +9,7 @@ def main(*files: str, results_file: str = "results.csv"):
     writer.writerow(["manifest_file", "time", "file", "result"])
     for manifest_file in files:
         print(f"Processing {manifest_file}")
-        manifest = Manifest.model_validate_json(open(manifest_file).read())
+        manifest = Manifest.model_validate_json(Path(manifest_file).read_bytes())
         for file in manifest.files:
             writer.writerow(
                 (
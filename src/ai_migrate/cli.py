@@ -7,6 +7,11 @@ Environment Variables:
 - AI_MIGRATE_PROJECT_PATH: Project path (required when not in interactive mode)
 - AI_MIGRATE_OPTION: Option to select in non-interactive mode for radiolist choices
 - AI_MIGRATE_YES_NO: Option to select in non-interactive mode for yes/no choices ('yes' or 'no')
+- AI_MIGRATE_MAX_EXAMPLES: Include only this many examples in each prompt, chosen by
+  embedding similarity to the files being migrated (default: all examples)
+- AI_MIGRATE_LLM_CACHE: If set, serve identical low-temperature completions from a
+  sqlite cache in ~/.cache/ai_migrate (for development; retries replay the cached response)
+- AI_MIGRATE_LLM_RPM: Limit OpenAI requests to this many per minute across all workers
 """
 
 import os
@@ -646,10 +651,10 @@ def project_dir_option(f):
         if not project_dir:
             project_dir = os.environ.get("AI_MIGRATE_PROJECT_DIR")
 
-        if not project_dir and Path(".ai-migrate").exists():
+        if not project_dir:
             try:
                 project_dir = json.loads(Path(".ai-migrate").read_text())["project_dir"]
-            except (json.JSONDecodeError, KeyError):
+            except (FileNotFoundError, json.JSONDecodeError, KeyError):
                 pass
 
         if not project_dir:
@@ -907,7 +912,7 @@ def cleanup_git_branches(manifest, force):
     branches = {
         branch
         for _, branch, *_ in get_branches(
-            Manifest.model_validate_json(Path(manifest).read_text())
+            Manifest.model_validate_json(Path(manifest).read_bytes())
         )
     }
 
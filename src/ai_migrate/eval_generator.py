@@ -43,12 +43,12 @@ def generate_eval_from_migration(
     project_dir = Path(project_template)
     eval_dir = project_dir / "evals" / eval_name
 
-    os.makedirs(eval_dir / "source", exist_ok=True)
+    source_dir = eval_dir / "source"
+    os.makedirs(source_dir, exist_ok=True)
 
+    # Sources are flattened into source_dir, so no other directories are needed
     for filename, content in source_files.items():
-        rel_path = Path(filename)
-        file_path = eval_dir / "source" / rel_path.name
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path = source_dir / Path(filename).name
         with open(file_path, "w") as f:
             f.write(content)
 
@@ -269,15 +269,26 @@ async def generate_eval_from_pr(pr_url: str, project_template: str) -> Path:
                     stderr=checkout_stderr,
                 )
 
-            for file_path in changed_files:
+            created_dirs = set()
+
+            def copy_changed_file(file_path: str):
                 src_file = Path(temp_dir) / file_path
                 if src_file.exists():
                     dst_file = source_dir / file_path
-                    dst_file.parent.mkdir(parents=True, exist_ok=True)
+                    if dst_file.parent not in created_dirs:
+                        dst_file.parent.mkdir(parents=True, exist_ok=True)
+                        created_dirs.add(dst_file.parent)
                     try:
                         shutil.copy2(src_file, dst_file)
                     except (IOError, OSError) as e:
                         logger.warning(f"Failed to copy file {file_path}: {e}")
 
+            await asyncio.gather(
+                *(
+                    asyncio.to_thread(copy_changed_file, file_path)
+                    for file_path in changed_files
+                )
+            )
+
     logger.info(f"Generated evaluation at {eval_dir}")
     return eval_dir
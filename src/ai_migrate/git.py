@@ -6,6 +6,8 @@ from ai_migrate.manifest import Manifest
 
 Status = Literal["pass", "fail", "?"]
 
+STATUS_RE = re.compile(r"Migration attempt \d+ status='(.*)':")
+
 
 def get_branches(
     manifest: Manifest | None = None,
@@ -28,8 +30,7 @@ def get_branches(
         sha, branch, msg = line.split(maxsplit=2)
         if branch.startswith("ai-migrator/"):
             if not in_manifest or branch.removeprefix("ai-migrator/") in in_manifest:
-                pattern = r"Migration attempt \d+ status='(.*)':"
-                match = re.search(pattern, msg)
+                match = STATUS_RE.search(msg)
                 status = match.group(1) if match else "?"
                 matching.append((sha, branch, status, msg))
 
@@ -1,6 +1,6 @@
 from importlib.metadata import entry_points
 
-from .openai import OpenAIClient
+from .openai import OpenAIClient, shared_openai_client
 from .base import BaseLLMClient
 
 try:
@@ -8,4 +8,4 @@ try:
 except KeyError:
     DefaultClient = OpenAIClient
 
-__all__ = ["BaseLLMClient", "DefaultClient", "OpenAIClient"]
+__all__ = ["BaseLLMClient", "DefaultClient", "OpenAIClient", "shared_openai_client"]
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CACHE_FILE = Path("~/.cache/ai_migrate/llm_cache.sqlite").expanduser()
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_RESPONSES = 10_000
+
+
+class ResponseCache:
+    """Exact-match cache of LLM responses, persisted in sqlite.
+
+    Entries are keyed on the canonical JSON of the request, so only a
+    byte-for-byte identical conversation (same model and sampling parameters)
+    is served from the cache. Entries expire ``ttl_seconds`` after they were
+    stored, and beyond ``max_entries`` the least recently used are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_CACHE_FILE,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_RESPONSES,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key BLOB PRIMARY KEY, response BLOB, created_at INT, used_at REAL)"
+            )
+            columns = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(responses)")
+            }
+            # Caches written before entries were evicted lack the access time
+            if "used_at" not in columns:
+                self._conn.execute("ALTER TABLE responses ADD COLUMN used_at REAL")
+                self._conn.execute("UPDATE responses SET used_at = created_at")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)"
+            )
+            self._evict()
+
+    @staticmethod
+    def key(**request: Any) -> bytes:
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).digest()
+
+    def _evict(self):
+        self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?",
+            (time.time() - self.ttl_seconds,),
+        )
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def get(self, key: bytes) -> dict[str, Any] | None:
+        row = self._conn.execute(
+            "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        response, created_at = row
+        with self._conn:
+            if time.time() - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key)
+            )
+        return json.loads(response)
+
+    def put(self, key: bytes, response: dict[str, Any]):
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, used_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response), int(now), now),
+            )
+            self._evict()
+
+
+class EmbeddingCache:
+    """Embedding vectors keyed by the sha256 of the model and embedded text.
+
+    Embeddings are deterministic, so entries never expire. The cache is used from
+    worker threads to keep sqlite off the event loop, so access is serialized
+    with a lock.
+    """
+
+    def __init__(self, path: Path | str = DEFAULT_CACHE_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key BLOB PRIMARY KEY, embedding BLOB)"
+            )
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        return hashlib.sha256(f"{model}\0{text}".encode()).digest()
+
+    def get(self, key: bytes) -> list[float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT embedding FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return array("d", row[0]).tolist()
+
+    def put(self, key: bytes, embedding: list[float]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                (key, array("d", embedding).tobytes()),
+            )
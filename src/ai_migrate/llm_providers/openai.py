@@ -1,10 +1,73 @@
+import asyncio
+import contextvars
+import os
 import tiktoken
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import cache, cached_property
 from typing import Any
 
 from openai import AsyncOpenAI
 from pydantic_ai.tools import ToolDefinition
 
+from .cache import EmbeddingCache, ResponseCache
+from .rate_limit import RateLimiter, rate_limiter_from_env
+
 GPT_VERSION = "gpt-4o"
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_MAX_TOKENS = 8191
+EMBEDDING_BATCH_SIZE = 96
+# The embeddings endpoint rejects requests with more tokens than this in total
+EMBEDDING_MAX_BATCH_TOKENS = 300_000
+
+# Responses sampled above this temperature are not reproducible enough to cache
+MAX_CACHEABLE_TEMPERATURE = 0.2
+
+
+# Shared by all clients, since the provider's rate limit applies per API key.
+# Built on first use, so a bad AI_MIGRATE_LLM_RPM fails the LLM call rather than
+# every import of the package.
+@cache
+def _rate_limiter() -> RateLimiter | None:
+    return rate_limiter_from_env()
+
+
+async def _throttle():
+    if limiter := _rate_limiter():
+        await limiter.acquire()
+
+
+# Holds the AsyncOpenAI shared by OpenAIClients created inside
+# shared_openai_client(), once one of them has opened it
+_SHARED_CLIENT: contextvars.ContextVar[list[AsyncOpenAI] | None] = (
+    contextvars.ContextVar("_SHARED_CLIENT", default=None)
+)
+
+
+@asynccontextmanager
+async def shared_openai_client():
+    """Share one AsyncOpenAI connection pool between the OpenAIClients created in
+    this block, including in tasks it spawns, and close it on exit.
+
+    Outside the block, each OpenAIClient opens its own pool.
+    """
+    slot = []
+    token = _SHARED_CLIENT.set(slot)
+    try:
+        yield
+    finally:
+        _SHARED_CLIENT.reset(token)
+        for client in slot:
+            await client.close()
+
+
+def _openai_client() -> AsyncOpenAI:
+    slot = _SHARED_CLIENT.get()
+    if slot is None:
+        return AsyncOpenAI()
+    if not slot:
+        slot.append(AsyncOpenAI())
+    return slot[0]
 
 
 def _tool(tool: ToolDefinition) -> dict:
@@ -18,11 +81,39 @@ def _tool(tool: ToolDefinition) -> dict:
     }
 
 
+def _truncate_for_embedding(text: str) -> tuple[str, int]:
+    """The text cut to EMBEDDING_MAX_TOKENS, and its token count."""
+    encoding = tiktoken.encoding_for_model(EMBEDDING_MODEL)
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= EMBEDDING_MAX_TOKENS:
+        return text, len(tokens)
+    return encoding.decode(tokens[:EMBEDDING_MAX_TOKENS]), EMBEDDING_MAX_TOKENS
+
+
+def _embedding_batches(token_counts: dict[int, int]) -> list[list[int]]:
+    """Group text indices into batches within the endpoint's request limits."""
+    batches = []
+    batch, batch_tokens = [], 0
+    for i, tokens in token_counts.items():
+        if batch and (
+            len(batch) == EMBEDDING_BATCH_SIZE
+            or batch_tokens + tokens > EMBEDDING_MAX_BATCH_TOKENS
+        ):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(i)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 class OpenAIClient:
     """A client for interacting with a large language model."""
 
     def __init__(self):
-        self._openai_client = AsyncOpenAI()
+        self._openai_client = _openai_client()
+        self._cache = ResponseCache() if os.getenv("AI_MIGRATE_LLM_CACHE") else None
 
     async def generate_completion(
         self,
@@ -57,11 +148,56 @@ class OpenAIClient:
         if response_format:
             kwargs["response_format"] = response_format
 
+        cache_key = None
+        if self._cache and not tools and temperature <= MAX_CACHEABLE_TEMPERATURE:
+            cache_key = ResponseCache.key(**kwargs)
+            if cached := self._cache.get(cache_key):
+                return cached, messages
+
+        await _throttle()
         response = await self._openai_client.chat.completions.create(**kwargs)
         response = response.model_dump()
 
+        if cache_key:
+            self._cache.put(cache_key, response)
+
         return response, messages
 
+    async def generate_completion_stream(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.1,
+        max_tokens: int = 8192,
+        model: str | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream the text of a completion as it is generated.
+
+        Lets callers start processing the response before the last token arrives.
+        To stop early, close the generator, e.g. by iterating inside
+        ``contextlib.aclosing``; that also closes the connection.
+
+        Args:
+            messages: The messages to send
+            temperature: The temperature to use for generation
+            max_tokens: The maximum number of tokens to generate
+            model: Optional model override
+
+        Yields:
+            Chunks of the response text
+        """
+        await _throttle()
+        response = await self._openai_client.chat.completions.create(
+            model=model or "gpt-4o",
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        async with response:
+            async for chunk in response:
+                if chunk.choices and (content := chunk.choices[0].delta.content):
+                    yield content
+
     async def generate_text(
         self,
         system_prompt: str,
@@ -86,6 +222,63 @@ class OpenAIClient:
         response, _ = await self.generate_completion(messages, temperature=temperature)
         return response["choices"][0]["message"]["content"]
 
+    @cached_property
+    def _embedding_cache(self) -> EmbeddingCache:
+        return EmbeddingCache()
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts for similarity search.
+
+        Texts that were embedded before are served from the embedding cache; the
+        rest are embedded in concurrent batches of at most EMBEDDING_BATCH_SIZE
+        texts and EMBEDDING_MAX_BATCH_TOKENS tokens. Each batch is cached as soon
+        as it completes, so a failed batch does not discard the others.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            One embedding vector per text, in the same order
+        """
+        keys = [EmbeddingCache.key(EMBEDDING_MODEL, text) for text in texts]
+
+        # The cache lookups and tokenizing block, so they run in a worker thread
+        def prepare():
+            embeddings = [self._embedding_cache.get(key) for key in keys]
+            inputs = {
+                i: _truncate_for_embedding(text)
+                for i, (text, embedding) in enumerate(zip(texts, embeddings))
+                if embedding is None
+            }
+            return embeddings, inputs
+
+        embeddings, inputs = await asyncio.to_thread(prepare)
+        batches = _embedding_batches({i: n for i, (_, n) in inputs.items()})
+
+        def store(batch: list[int]):
+            for i in batch:
+                self._embedding_cache.put(keys[i], embeddings[i])
+
+        async def embed_batch(batch: list[int]):
+            await _throttle()
+            response = await self._openai_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=[inputs[i][0] for i in batch],
+            )
+            for i, item in zip(batch, response.data):
+                embeddings[i] = item.embedding
+            await asyncio.to_thread(store, batch)
+
+        # Let every batch finish before raising, so successful ones are cached
+        results = await asyncio.gather(
+            *(embed_batch(batch) for batch in batches), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        return embeddings
+
     def count_tokens(self, text: str | list[dict[str, Any]] | None) -> int:
         if not text:
             return 0
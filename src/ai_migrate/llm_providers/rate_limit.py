@@ -0,0 +1,54 @@
+import asyncio
+import math
+import os
+import time
+
+
+class RateLimiter:
+    """Token bucket that keeps requests under a per-minute rate.
+
+    Up to ``burst`` requests go through immediately; after that, requests are
+    admitted as the bucket refills at ``per_minute / 60`` tokens per second.
+    """
+
+    def __init__(self, per_minute: float, burst: float | None = None):
+        if not (math.isfinite(per_minute) and per_minute > 0):
+            raise ValueError(f"per_minute must be a positive number, got {per_minute}")
+        if burst is not None and not (math.isfinite(burst) and burst > 0):
+            raise ValueError(f"burst must be a positive number, got {burst}")
+        self.rate = per_minute / 60
+        self.capacity = burst if burst is not None else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    async def acquire(self, tokens: float = 1):
+        # The bucket never holds more than capacity, so a larger request would
+        # wait forever
+        if tokens > self.capacity:
+            raise ValueError(
+                f"Cannot acquire {tokens} tokens from a bucket of {self.capacity}"
+            )
+        self._refill()
+        while self.tokens < tokens:
+            await asyncio.sleep((tokens - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= tokens
+
+
+def rate_limiter_from_env() -> RateLimiter | None:
+    """The limiter configured by AI_MIGRATE_LLM_RPM, or None if unset."""
+    if rpm := os.getenv("AI_MIGRATE_LLM_RPM"):
+        try:
+            return RateLimiter(float(rpm))
+        except ValueError:
+            raise ValueError(
+                f"AI_MIGRATE_LLM_RPM must be a positive number of requests per minute, got {rpm!r}"
+            ) from None
+    return None
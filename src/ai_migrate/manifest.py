@@ -28,7 +28,7 @@ class FileGroup(BaseModel):
 
     def group_name(self) -> str:
         if len(self.files) == 1:
-            return FileEntry(filename=self.files[0]).group_name()
+            return flatten(self.files[0])
         hsh = sha256(",".join(sorted(self.files)).encode()).hexdigest()[:8]
         return f"{flatten(self.files[0])}-{hsh}"
 
@@ -51,7 +51,7 @@ class Directory(BaseModel):
         files = []
         dir_path = Path(self.dir)
 
-        if dir_path.exists() and dir_path.is_dir():
+        if dir_path.is_dir():
             if "{" in self.glob and "}" in self.glob:
                 prefix, suffix = self.glob.split("{", 1)
                 extensions = suffix.split("}", 1)[0].split(",")
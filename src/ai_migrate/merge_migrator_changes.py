@@ -6,7 +6,7 @@ from ai_migrate.manifest import Manifest
 
 
 def merge(manifest_file: str):
-    manifest = Manifest.model_validate_json(Path(manifest_file).read_text())
+    manifest = Manifest.model_validate_json(Path(manifest_file).read_bytes())
     matching_branches = [
         (branch, status) for _, branch, status, _ in get_branches(manifest)
     ]
@@ -1,5 +1,6 @@
 import asyncio
 import contextvars
+import math
 import os
 import shutil
 import sys
@@ -8,7 +9,7 @@ import traceback
 from dataclasses import dataclass
 from pathlib import Path
 import subprocess
-from typing import Any, Iterable, Optional
+from typing import Any, Awaitable, Callable, Iterable, Optional
 
 from pydantic_ai.messages import ToolCallPart
 from pydantic_ai.tools import Tool
@@ -72,24 +73,32 @@ def read_file_pairs_from(examples_dir: str | Path) -> Iterable[MigrationExample]
 
     def get_files_recursively(directory: Path) -> list[FileContent]:
         """Recursively get all files in a directory, maintaining relative paths."""
-        files = []
-        for item in directory.rglob("*"):
-            if item.is_file():
-                relative_path = item.relative_to(directory)
-                files.append(
-                    FileContent(name=str(relative_path), content=item.read_text())
-                )
-        return files
+        paths = []
+
+        def walk(path: str):
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        walk(entry.path)
+                    elif entry.is_file():
+                        paths.append(entry.path)
+
+        walk(str(directory))
+        prefix_len = len(str(directory)) + len(os.sep)
+        return [
+            FileContent(name=path[prefix_len:], content=Path(path).read_text())
+            for path in sorted(paths)
+        ]
 
-    old_dirs = [
-        d for d in examples_dir.iterdir() if d.is_dir() and d.name.endswith(".old")
-    ]
+    entries = {entry.name: entry for entry in examples_dir.iterdir()}
 
-    for old_dir in old_dirs:
-        base_name = old_dir.name.removesuffix(".old")
-        new_dir = old_dir.parent / f"{base_name}.new"
+    for name, old_dir in entries.items():
+        if not (name.endswith(".old") and old_dir.is_dir()):
+            continue
+        base_name = name.removesuffix(".old")
+        new_dir = entries.get(f"{base_name}.new")
 
-        if new_dir.exists() and new_dir.is_dir():
+        if new_dir is not None and new_dir.is_dir():
             old_files = get_files_recursively(old_dir)
             new_files = get_files_recursively(new_dir)
 
@@ -97,12 +106,12 @@ def read_file_pairs_from(examples_dir: str | Path) -> Iterable[MigrationExample]
                 name=base_name, old_files=old_files, new_files=new_files
             )
 
-    for file in examples_dir.iterdir():
-        if file.is_file() and ".old." in file.name:
-            base, ext = file.name.split(".old.", 1)
-            new_file = file.parent / f"{base}.new.{ext}"
+    for name, file in entries.items():
+        if ".old." in name and file.is_file():
+            base, ext = name.split(".old.", 1)
+            new_file = entries.get(f"{base}.new.{ext}")
 
-            if new_file.exists():
+            if new_file is not None:
                 old_content = FileContent(
                     name=f"{base}.{ext}", content=file.read_text()
                 )
@@ -147,13 +156,15 @@ LANGUAGE_EXTENSIONS = {
 }
 
 
+_LANGUAGE_BY_EXTENSION = {
+    extension: language
+    for language, extensions in LANGUAGE_EXTENSIONS.items()
+    for extension in extensions
+}
+
+
 def detect_language(filename: str) -> str:
-    extension = Path(filename).suffix
-    for language, extensions in LANGUAGE_EXTENSIONS.items():
-        for e in extensions:
-            if e == extension:
-                return language
-    return ""
+    return _LANGUAGE_BY_EXTENSION.get(Path(filename).suffix, "")
 
 
 def wrap_in_code_block(text: str, filename: str | None) -> str:
@@ -261,6 +272,50 @@ def combine_examples_into_conversation(
     return messages
 
 
+async def select_relevant_examples(
+    client: DefaultClient,
+    examples: list[MigrationExample],
+    target: MigrationExample,
+    max_examples: int,
+) -> list[MigrationExample]:
+    """Keep the examples whose old files are most similar to the target files.
+
+    Returns at most max_examples examples, most similar first.
+    """
+    texts = [
+        "\n\n".join(fc.content for fc in example.old_files)
+        for example in (target, *examples)
+    ]
+    target_embedding, *example_embeddings = await client.embed(texts)
+    target_norm = math.hypot(*target_embedding)
+
+    def similarity(embedding: list[float]) -> float:
+        norm = target_norm * math.hypot(*embedding)
+        return math.sumprod(target_embedding, embedding) / norm if norm else 0.0
+
+    scores = [similarity(embedding) for embedding in example_embeddings]
+    ranked = sorted(range(len(examples)), key=scores.__getitem__, reverse=True)
+    return [examples[i] for i in ranked[:max_examples]]
+
+
+def max_examples_from_env() -> int:
+    """The AI_MIGRATE_MAX_EXAMPLES limit, or 0 (use every example) if unset or invalid."""
+    value = os.getenv("AI_MIGRATE_MAX_EXAMPLES")
+    if not value:
+        return 0
+    try:
+        max_examples = int(value)
+    except ValueError:
+        max_examples = -1
+    if max_examples < 0:
+        log(
+            f"AI_MIGRATE_MAX_EXAMPLES must be a non-negative integer, got {value!r}; "
+            "using all examples"
+        )
+        return 0
+    return max_examples
+
+
 async def call_llm(
     client: DefaultClient,
     messages: list,
@@ -336,6 +391,21 @@ async def subprocess_run(cmd, prefix=None, **kwargs) -> str:
     return "\n".join(stdout)
 
 
+# Runs a verify command in a directory, returning (returncode, stdout, stderr)
+VerifyRunner = Callable[[list[str], Path], Awaitable[tuple[int, bytes, bytes]]]
+
+
+async def run_verify(cmd: list[str], cwd: Path) -> tuple[int, bytes, bytes]:
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    return process.returncode, stdout, stderr
+
+
 async def run(
     target_files: list[str],
     system_prompt,
@@ -481,10 +551,8 @@ def extract_code_blocks(markdown, replacement="<code>") -> CodeResponseResult:
     other_text = []
 
     for line in line_it:
-        if line.lstrip().startswith("### ") and line.count("`") == 2:
-            start = line.find("`")
-            end = line.find("`", start + 1)
-            filename = line[start + 1 : end]
+        if line.lstrip().startswith("### ") and len(parts := line.split("`")) == 3:
+            filename = parts[1]
         elif line.lstrip().startswith("```"):
             code = []
             for line in line_it:
@@ -534,6 +602,7 @@ async def _run(
     target_basename: str = None,
     tools: list[Tool] = None,
     goose_config: Optional[GooseConfig] = None,
+    verify_runner: VerifyRunner = run_verify,
 ):
     if llm_fakes:
         client = FakeLLMClient(llm_fakes)
@@ -542,48 +611,57 @@ async def _run(
 
     verify_cmd = verify_cmd.split()
 
-    examples = [*read_file_pairs_from(examples_dir)]
+    def read_target_file(target_file) -> FileContent:
+        full_path = Path(target_file).absolute()
+        if target_dir:
+            short_name = full_path.name
+        else:
+            short_name = full_path.relative_to(worktree_root)
+        return FileContent(name=str(short_name), content=full_path.read_text())
+
+    # Read examples, the system prompt and the target files concurrently
+    examples, system_prompt, target_file_contents = await asyncio.gather(
+        asyncio.to_thread(lambda: [*read_file_pairs_from(examples_dir)]),
+        asyncio.to_thread(Path(system_prompt).read_text),
+        asyncio.gather(*(asyncio.to_thread(read_target_file, f) for f in target_files)),
+    )
     if not examples:
         raise FileNotFoundError("No valid example pairs found in examples directory")
 
-    system_prompt = Path(system_prompt).read_text()
-
     # TODO: Have some kind of configuration driven controls for how basename is transformed
     if target_basename:
         target_basename = (
             target_basename.replace("-", " ").replace("_", " ").title().replace(" ", "")
         )
 
-    # Create target MigrationExample
-    target_file_contents = []
-    for i, target_file in enumerate(target_files):
-        full_path = Path(target_file).absolute()
-
-        if target_dir:
-            read_path = Path(target_files[i]).absolute()
-            short_name = full_path.name
-            content = read_path.read_text()
-        else:
-            short_name = full_path.relative_to(worktree_root)
-            content = full_path.read_text()
-
-        target_file_contents.append(FileContent(name=str(short_name), content=content))
+    # Migrated files are written under output_root, at output_root_rel in the worktree
+    worktree_root = Path(worktree_root)
+    if target_dir:
+        output_root_rel = Path(target_dir_rel_path) / target_basename
+    else:
+        output_root_rel = Path()
+    output_root = worktree_root / output_root_rel
 
+    # Create target MigrationExample
     target = MigrationExample(name=None, old_files=target_file_contents, new_files=[])
 
+    max_examples = max_examples_from_env()
+    if 0 < max_examples < len(examples) and hasattr(client, "embed"):
+        try:
+            examples = await select_relevant_examples(
+                client, examples, target, max_examples
+            )
+            log(f"[agent] Selected examples: {[e.name for e in examples]}")
+        except Exception as e:
+            log(f"Error selecting relevant examples, using all of them: {e}")
+
     messages = combine_examples_into_conversation(examples, target, system_prompt)
     all_files_to_verify = set()
 
     def build_verify_cmd(all_files_to_verify: set[str]):
         if target_dir:
-            return [
-                *verify_cmd,
-                str(Path(target_dir_rel_path) / target_basename),
-            ]
-        return [
-            *verify_cmd,
-            *[str(Path(worktree_root) / f) for f in all_files_to_verify],
-        ]
+            return [*verify_cmd, str(output_root_rel)]
+        return [*verify_cmd, *[str(worktree_root / f) for f in all_files_to_verify]]
 
     full_verify_cmd = build_verify_cmd(all_files_to_verify)
 
@@ -654,15 +732,7 @@ async def _run(
 
             if code_block.filename:
                 written_files.add(code_block.filename)
-                if target_dir:
-                    output_path = (
-                        Path(worktree_root)
-                        / target_dir_rel_path
-                        / target_basename
-                        / code_block.filename
-                    )
-                else:
-                    output_path = Path(worktree_root) / code_block.filename
+                output_path = output_root / code_block.filename
                 output_path.parent.mkdir(parents=True, exist_ok=True)
 
                 with open(output_path, "w") as f:
@@ -673,33 +743,17 @@ async def _run(
         full_verify_cmd = build_verify_cmd(all_files_to_verify)
 
         log(f"Running verification: {full_verify_cmd}")
-        verify_process = await asyncio.create_subprocess_exec(
-            *full_verify_cmd,
-            cwd=worktree_root,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        stdout, stderr = await verify_process.communicate()
+        returncode, stdout, stderr = await verify_runner(full_verify_cmd, worktree_root)
 
-        status = "pass" if verify_process.returncode == 0 else "fail"
+        status = "pass" if returncode == 0 else "fail"
 
         commit_message = f"Migration attempt {tries + 1} {status=}:\n\nLLM response:\n{parsed_result.other_text}"
 
         for file in written_files:
-            if target_dir:
-                file_path = (
-                    Path(worktree_root) / target_dir_rel_path / target_basename / file
-                )
-                git_path = Path(file_path).relative_to(worktree_root)
-                await subprocess_run(
-                    ["git", "add", git_path],
-                    cwd=worktree_root,
-                )
-            else:
-                await subprocess_run(
-                    ["git", "add", file],
-                    cwd=worktree_root,
-                )
+            await subprocess_run(
+                ["git", "add", output_root_rel / file],
+                cwd=worktree_root,
+            )
 
         await subprocess_run(
             ["git", "commit", "--allow-empty", "-m", commit_message],
@@ -723,7 +777,7 @@ async def _run(
             cwd=worktree_root,
         )
 
-        if verify_process.returncode == 0:
+        if returncode == 0:
             log("Verification successful")
 
             if not dont_create_evals:
@@ -739,7 +793,7 @@ async def _run(
 
                 transformed_contents = {}
                 for file_path in written_files:
-                    full_path = Path(worktree_root) / file_path
+                    full_path = worktree_root / file_path
                     try:
                         with open(full_path, "r") as f:
                             transformed_contents[file_path] = f.read()
@@ -810,7 +864,7 @@ async def _run(
                 goose_user_extra = Path(goose_config.user_prompt).read_text()
 
             directory_instructions = (
-                f"You may only make changes to the files inside {target_dir_rel_path}/{target_basename}. Under no circumstances should you touch any files outside of this directory. If I detect that you do, I will be very disappointed in you and will switch to a smarter model."
+                f"You may only make changes to the files inside {output_root_rel}. Under no circumstances should you touch any files outside of this directory. If I detect that you do, I will be very disappointed in you and will switch to a smarter model."
                 if target_dir
                 else f"You may only make changes to the files: {', '.join(target_files)}. Under no circumstances should you touch any other files."
             )
@@ -896,9 +950,8 @@ async def _run(
                     cwd=worktree_root,
                 )
 
-                git_path = Path(target_dir_rel_path) / target_basename
                 await subprocess_run(
-                    ["git", "add", git_path],
+                    ["git", "add", output_root_rel],
                     cwd=worktree_root,
                 )
             else:
@@ -913,15 +966,10 @@ async def _run(
                         cwd=worktree_root,
                     )
 
-            verify_process = await asyncio.create_subprocess_exec(
-                *full_verify_cmd,
-                cwd=worktree_root,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+            exit_code, stdout, stderr = await verify_runner(
+                full_verify_cmd, worktree_root
             )
-            stdout, stderr = await verify_process.communicate()
             verification_output = (stderr or stdout or b"").decode()
-            exit_code = verify_process.returncode
 
             if exit_code > best_exit_code and best_exit_code != 0:
                 log(
@@ -7,6 +7,25 @@ from pathlib import Path
 from ai_migrate.llm_providers import DefaultClient
 from ai_migrate.utils import generate_system_prompt, PRDetails
 
+EXTRACT_EXAMPLE_SYSTEM_PROMPT = """You are an expert at identifying code migration patterns.
+Given a before and after version of a file, extract the minimal, representative example that 
+clearly demonstrates the migration pattern. Focus on the core transformation pattern, not incidental changes."""
+
+SYNTHESIZE_EXAMPLE_SYSTEM_PROMPT = """You are an expert at creating code examples for migration patterns.
+Given a PR title and description, create a minimal example that demonstrates the migration pattern described."""
+
+BEFORE_BLOCK_RE = re.compile(r"BEFORE:\s*```.*?\n(.*?)```", re.DOTALL)
+AFTER_BLOCK_RE = re.compile(r"AFTER:\s*```.*?\n(.*?)```", re.DOTALL)
+
+
+def _parse_before_after(response: str) -> tuple[str, str] | None:
+    """Extract the BEFORE and AFTER code blocks from an LLM response."""
+    before_match = BEFORE_BLOCK_RE.search(response)
+    after_match = AFTER_BLOCK_RE.search(response)
+    if before_match and after_match:
+        return before_match.group(1).strip(), after_match.group(1).strip()
+    return None
+
 
 async def _run_gh_command(args: list) -> str:
     """Run a GitHub CLI command and return its output.
@@ -189,10 +208,6 @@ async def extract_example_patterns(
                 print(f"Skipping {file_path} - content not available")
                 continue
 
-            system_prompt = """You are an expert at identifying code migration patterns.
-Given a before and after version of a file, extract the minimal, representative example that 
-clearly demonstrates the migration pattern. Focus on the core transformation pattern, not incidental changes."""
-
             user_prompt = f"""
 Analyze these before and after versions of a file and extract a minimal example that demonstrates the key migration pattern:
 
@@ -212,23 +227,16 @@ demonstrating the pattern clearly. Remove any code that doesn't directly demonst
 Respond with two code blocks labeled BEFORE and AFTER containing your minimal examples.
 """
 
-            response = await client.generate_text(system_prompt, user_prompt)
-
-            before_match = re.search(r"BEFORE:\s*```.*?\n(.*?)```", response, re.DOTALL)
-            after_match = re.search(r"AFTER:\s*```.*?\n(.*?)```", response, re.DOTALL)
-
-            if before_match and after_match:
-                before_example = before_match.group(1).strip()
-                after_example = after_match.group(1).strip()
-                examples.append((before_example, after_example))
+            response = await client.generate_text(
+                EXTRACT_EXAMPLE_SYSTEM_PROMPT, user_prompt
+            )
+            if example := _parse_before_after(response):
+                examples.append(example)
         except Exception as e:
             print(f"Error processing file {file_path}: {e}")
 
     if not examples and pr_details.title and pr_details.body:
         try:
-            system_prompt = """You are an expert at creating code examples for migration patterns.
-Given a PR title and description, create a minimal example that demonstrates the migration pattern described."""
-
             user_prompt = f"""
 Create a minimal example that demonstrates the migration pattern described in this PR:
 
@@ -239,15 +247,11 @@ Create two code blocks labeled BEFORE and AFTER that show the migration pattern.
 The examples should be minimal but clearly demonstrate the key changes involved in this migration.
 """
 
-            response = await client.generate_text(system_prompt, user_prompt)
-
-            before_match = re.search(r"BEFORE:\s*```.*?\n(.*?)```", response, re.DOTALL)
-            after_match = re.search(r"AFTER:\s*```.*?\n(.*?)```", response, re.DOTALL)
-
-            if before_match and after_match:
-                before_example = before_match.group(1).strip()
-                after_example = after_match.group(1).strip()
-                examples.append((before_example, after_example))
+            response = await client.generate_text(
+                SYNTHESIZE_EXAMPLE_SYSTEM_PROMPT, user_prompt
+            )
+            if example := _parse_before_after(response):
+                examples.append(example)
         except Exception as e:
             print(f"Error creating example from PR description: {e}")
 
@@ -1,11 +1,15 @@
 import asyncio
 import sys
 import itertools
+from collections import deque
 from enum import StrEnum
 from typing import Dict
 import shutil
 
 
+SPINNER_CHARS = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+
+
 class Status(StrEnum):
     PASSED = "passed"
     FAILED = "failed"
@@ -16,12 +20,11 @@ class Status(StrEnum):
 class StatusLog:
     def __init__(self, line_limit):
         self.line_limit = line_limit
-        self.lines = [""] * line_limit
+        self.lines = deque([""] * line_limit, maxlen=line_limit)
         self.header = ""
 
     def write(self, s: str):
         self.lines.extend(s.removesuffix("\n").splitlines())
-        self.lines = self.lines[-self.line_limit :]
 
     def flush(self):
         pass
@@ -39,19 +42,15 @@ class StatusBar:
         self.name = name
         self.status = Status.WAITING
         self.message = ""
-        self.spinner_chars = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
-        self.spinner_iter = itertools.cycle(self.spinner_chars)
         self.logger = StatusLog(line_limit=3)
 
-    def render(self) -> str:
-        terminal_width = shutil.get_terminal_size((80, 20)).columns
-
+    def render(self, terminal_width: int, spinner: str) -> list[str]:
         if self.status == Status.PASSED:
             status_symbol = "✓"
         elif self.status == Status.FAILED:
             status_symbol = "✗"
         else:
-            status_symbol = next(self.spinner_iter)
+            status_symbol = spinner
 
         right_part = status_symbol
         if self.message:
@@ -67,9 +66,7 @@ class StatusBar:
             if self.status == Status.RUNNING
             else []
         )
-        return f"\r{name_part}{' ' * max(0, padding)}{right_part}" + (
-            f"\n{'\n'.join(logs)}" if logs else ""
-        )
+        return [f"\r{name_part}{' ' * max(0, padding)}{right_part}", *logs]
 
     def get_logger(self, header: str):
         self.logger.header = header
@@ -78,35 +75,40 @@ class StatusBar:
 
 class StatusManager:
     def __init__(self):
+        # Only mutated from the event loop, so renders can read it without locking
         self.bars: Dict[str, StatusBar] = {}
-        self.lock = asyncio.Lock()
         self.is_terminal = sys.stdout.isatty()
         self._running = True
         self._render_task = None
         self._last_render_lines = 0
+        self._spinner = itertools.cycle(SPINNER_CHARS)
+        # Set when a bar changes; running bars also need redrawing for their spinners
+        self._dirty = True
+        self._animated = False
 
     async def add_status(self, name: str) -> StatusBar:
-        async with self.lock:
-            bar = StatusBar(name)
-            self.bars[name] = bar
-            if self._render_task is None:
-                self._render_task = asyncio.create_task(self._render_loop())
-            await self.render()
-            return bar
+        bar = StatusBar(name)
+        self.bars[name] = bar
+        self._dirty = True
+        if self._render_task is None:
+            self._render_task = asyncio.create_task(self._render_loop())
+        return bar
 
     async def _render_loop(self):
         while self._running:
-            await self.render()
+            if self._dirty or self._animated:
+                await self.render()
             await asyncio.sleep(0.1)
 
     async def render(self):
         if not self.is_terminal:
             return
 
-        sys.stdout.write("\033[2K\033[A" * self._last_render_lines)
-        sys.stdout.flush()
-
-        self._last_render_lines = 0
+        self._dirty = False
+        self._animated = False
+        terminal_width = shutil.get_terminal_size((80, 20)).columns
+        spinner = next(self._spinner)
+        frame = []
         bars = list(self.bars.values())
         bars = itertools.groupby(
             sorted(bars, key=lambda bar: (bar.status, bar.name)),
@@ -115,25 +117,29 @@ class StatusManager:
         for status, bars in bars:
             bars = [*bars]
             if status == Status.WAITING:
-                print(f"{len(bars)} more in queue...")
-                self._last_render_lines += 1
+                frame.append(f"{len(bars)} more in queue...")
             else:
+                self._animated |= status == Status.RUNNING
                 for bar in bars:
-                    rendered = bar.render()
-                    print(rendered)
-                    self._last_render_lines += len(rendered.splitlines())
+                    frame.extend(bar.render(terminal_width, spinner))
+
+        # Erase the previous frame and draw the new one in a single write
+        sys.stdout.write(
+            "\033[2K\033[A" * self._last_render_lines
+            + "".join(f"{line}\n" for line in frame)
+        )
+        sys.stdout.flush()
+        self._last_render_lines = len(frame)
 
     async def mark_with_status(self, name: str, status: Status):
-        async with self.lock:
-            if name in self.bars:
-                self.bars[name].status = status
-                await self.render()
+        if name in self.bars:
+            self.bars[name].status = status
+            self._dirty = True
 
     async def set_message(self, name: str, message: str):
-        async with self.lock:
-            if name in self.bars:
-                self.bars[name].message = message
-                await self.render()
+        if name in self.bars:
+            self.bars[name].message = message
+            self._dirty = True
 
     async def stop(self):
         self._running = False
@@ -143,6 +149,8 @@ class StatusManager:
                 await self._render_task
             except asyncio.CancelledError:
                 pass
+        if self._dirty:
+            await self.render()
 
     def get_logger(self, name: str, header: str = ""):
         return self.bars[name].get_logger(header=header)
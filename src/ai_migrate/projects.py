@@ -9,6 +9,7 @@ import sys
 from typing import Iterable
 
 from ai_migrate.git import get_branches
+from ai_migrate.llm_providers import shared_openai_client
 from pydantic_ai.tools import Tool
 
 from .manifest import (
@@ -20,16 +21,25 @@ from .manifest import (
 from .migrate import run as run_migration, FailedPreVerification
 from .progress import StatusManager, Status
 
+ATTEMPT_RE = re.compile(r"Migration attempt (\d+) status=")
 
-def get_git_sha(directory: str | Path) -> str:
-    """Get the git SHA for HEAD of the repo in the current directory"""
-    res = subprocess.run(
-        ["git", "rev-parse", "HEAD"],
+
+async def get_git_sha(directory: str | Path) -> str:
+    """Get the git SHA for HEAD of the repo in the given directory"""
+    proc = await asyncio.create_subprocess_exec(
+        "git",
+        "rev-parse",
+        "HEAD",
         cwd=str(directory),
-        check=True,
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
     )
-    return res.stdout.decode().strip()
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(
+            proc.returncode, ["git", "rev-parse", "HEAD"], stdout, stderr
+        )
+    return stdout.decode().strip()
 
 
 def normalize_file_group(
@@ -101,15 +111,19 @@ async def run(
     dont_create_evals: bool = False,
 ) -> list[FileGroup]:
     """Run an AI migration project."""
-    if manifest_file:
-        with open(manifest_file) as f:
-            manifest = Manifest.model_validate_json(f.read())
-    else:
-        manifest = Manifest(files=[])
+
+    def load_manifest() -> Manifest:
+        if manifest_file:
+            return Manifest.model_validate_json(Path(manifest_file).read_bytes())
+        return Manifest(files=[])
 
     if resume:
-        git_manifest = manifest_from_git()
+        manifest, git_manifest = await asyncio.gather(
+            asyncio.to_thread(load_manifest), asyncio.to_thread(manifest_from_git)
+        )
         manifest = merge_manifests(manifest, git_manifest)
+    else:
+        manifest = load_manifest()
 
     target_sha = None
 
@@ -130,42 +144,43 @@ async def run(
         file_list = [f for f in file_list if f.result != "pass"]
 
     logs_dir = Path(logs_dir)
+    logs_dir.mkdir(parents=True, exist_ok=True)
+
+    if first_file := next((f.files[0] for f in file_list if f.files), None):
+        target_sha = await get_git_sha(Path(first_file).parent)
 
     status_manager = StatusManager()
 
     tools = load_tools_from_dir(project_dir)
 
-    async def process_one_fileset(index, files: FileGroup, task_name: str):
-        nonlocal target_sha
-        if target_sha is None:
-            target_sha = get_git_sha(Path(files.files[0]).parent)
+    system_prompt = manifest.system_prompt.format(project_dir=project_dir)
+    examples_dir = Path(project_dir) / "examples"
+    verify_cmd = manifest.verify_cmd.format(project_dir=project_dir, py=sys.executable)
+    pre_verify_cmd = manifest.pre_verify_cmd.format(
+        project_dir=project_dir, py=sys.executable
+    )
+    if manifest.goose_config:
+        manifest.goose_config.user_prompt = manifest.goose_config.user_prompt.format(
+            project_dir=project_dir
+        )
 
+    async def process_one_fileset(index, files: FileGroup, task_name: str):
         await status_manager.mark_with_status(task_name, Status.RUNNING)
 
         log_file = (logs_dir / task_name).with_suffix(".log")
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        log_buffer = open(log_file, "w")
+        log_buffer = open(log_file, "w", buffering=64 * 1024)
 
         logger = Tee(
             status_manager.get_logger(task_name, header=f"==> {log_file} <=="),
             log_buffer,
         )
-        if manifest.goose_config:
-            manifest.goose_config.user_prompt = (
-                manifest.goose_config.user_prompt.format(project_dir=project_dir)
-            )
-
         try:
             await run_migration(
                 files.files,
-                manifest.system_prompt.format(project_dir=project_dir),
-                Path(project_dir) / "examples",
-                verify_cmd=manifest.verify_cmd.format(
-                    project_dir=project_dir, py=sys.executable
-                ),
-                pre_verify_cmd=manifest.pre_verify_cmd.format(
-                    project_dir=project_dir, py=sys.executable
-                ),
+                system_prompt,
+                examples_dir,
+                verify_cmd=verify_cmd,
+                pre_verify_cmd=pre_verify_cmd,
                 log_stream=logger,
                 local_worktrees=local_worktrees,
                 llm_fakes=llm_fakes,
@@ -182,7 +197,7 @@ async def run(
             new_result = "fail-pre-verify"
         except Exception:
             await status_manager.mark_with_status(task_name, Status.FAILED)
-            traceback.print_exc(file=logger)
+            logger.write(traceback.format_exc())
             new_result = "fail"
         finally:
             log_buffer.close()
@@ -199,7 +214,8 @@ async def run(
                 print("Unexpected error in task", task_name)
                 traceback.print_exc()
 
-    async with asyncio.TaskGroup() as tg:
+    # File groups share one LLM connection pool, closed once they have all finished
+    async with shared_openai_client(), asyncio.TaskGroup() as tg:
         for i, file_set in enumerate(file_list):
             task_name = Path(file_set.files[0]).name
             if len(file_set.files) > 1:
@@ -208,6 +224,8 @@ async def run(
             await status_manager.add_status(task_name)
             tg.create_task(process_one_with_sem(i, file_set, task_name))
 
+    await status_manager.stop()
+
     print("Project run complete.")
     print("Failing files:")
     for file in results:
@@ -220,21 +238,21 @@ async def run(
             for fn in file.files:
                 print(fn)
 
-    ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+    finished_at = datetime.now()
+    ts = finished_at.strftime("%Y%m%d-%H%M%S")
     results_file = f"manifest-{ts}.json"
-    with open(results_file, "w") as f:
-        result_manifest = manifest.model_copy(
-            update={
-                "files": results,
-                "eval_target_repo_ref": target_sha,
-                "time": datetime.now(),
-            }
-        )
-        f.write(
-            result_manifest.model_dump_json(
-                indent=2, exclude_defaults=True, exclude_none=True
-            )
+    result_manifest = manifest.model_copy(
+        update={
+            "files": results,
+            "eval_target_repo_ref": target_sha,
+            "time": finished_at,
+        }
+    )
+    Path(results_file).write_text(
+        result_manifest.model_dump_json(
+            indent=2, exclude_defaults=True, exclude_none=True
         )
+    )
 
     print(f"Results saved to {results_file}")
     return results
@@ -242,7 +260,7 @@ async def run(
 
 def verify(project_dir: str, files: Iterable[str], manifest_file: str | None):
     if manifest_file:
-        manifest = Manifest.model_validate_json(Path(manifest_file).read_text())
+        manifest = Manifest.model_validate_json(Path(manifest_file).read_bytes())
     else:
         manifest = Manifest()
     verify_cmd = manifest.verify_cmd.format(project_dir=project_dir, py=sys.executable)
@@ -251,7 +269,7 @@ def verify(project_dir: str, files: Iterable[str], manifest_file: str | None):
 
 def pre_verify(project_dir: str, file: str, manifest_file: str | None):
     if manifest_file:
-        manifest = Manifest.model_validate_json(Path(manifest_file).read_text())
+        manifest = Manifest.model_validate_json(Path(manifest_file).read_bytes())
     else:
         manifest = Manifest()
     verify_cmd = manifest.pre_verify_cmd.format(
@@ -261,7 +279,7 @@ def pre_verify(project_dir: str, file: str, manifest_file: str | None):
 
 
 def status(manifest_file: str):
-    manifest = Manifest.model_validate_json(Path(manifest_file).read_text())
+    manifest = Manifest.model_validate_json(Path(manifest_file).read_bytes())
     branches = get_branches(manifest)
     passing = []
     failing = []
@@ -283,7 +301,7 @@ def status(manifest_file: str):
         return "/".join(parts)
 
     def extract_attempts(msg: str) -> int | None:
-        match = re.search(r"Migration attempt (\d+) status=", msg)
+        match = ATTEMPT_RE.search(msg)
         if match:
             return match.group(1)
 
@@ -1,3 +1,4 @@
+import os
 from importlib.metadata import entry_points
 
 from pathlib import Path
@@ -9,11 +10,16 @@ class ProjectsRoot:
         self.root_dir = Path(root_dir)
 
     def list_projects(self) -> Iterable[Path]:
-        if not self.root_dir.exists() or not self.root_dir.is_dir():
-            return []
-        for p in self.root_dir.iterdir():
-            if p.is_dir():
-                yield p
+        try:
+            entries = os.scandir(self.root_dir)
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        # scandir reports entry types from the directory listing, so this
+        # avoids a stat per entry
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    yield Path(entry.path)
 
 
 _ROOTS = [
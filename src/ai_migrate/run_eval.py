@@ -101,7 +101,7 @@ def run_project_eval(project, verbose=False):
         project_dir = ws.temp_dir / "migrate-project"
 
         source_project_dir = Path(project)
-        if not source_project_dir.exists() or not source_project_dir.is_dir():
+        if not source_project_dir.is_dir():
             source_project_dir = AI_MIGRATE_PROJECT_DIR / "projects" / project
 
         logger.info(f"Copying project files from {source_project_dir} to {project_dir}")
@@ -117,7 +117,7 @@ def run_project_eval(project, verbose=False):
             logger.info(f"Processing eval: {project}/{directory.name}")
             logger.info(f"Reading manifest file: {manifest_file}")
 
-            manifest = Manifest.model_validate_json(manifest_file.read_text())
+            manifest = Manifest.model_validate_json(manifest_file.read_bytes())
             logger.info(f"Manifest loaded with {len(manifest.files)} file entries")
 
             if manifest.eval_target_repo_remote and manifest.eval_target_repo_ref:
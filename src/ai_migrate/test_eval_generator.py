@@ -12,53 +12,68 @@ from ai_migrate.eval_generator import (
     generate_eval_from_pr,
 )
 
+_PR_VIEW_STDOUT = json.dumps(
+    {
+        "title": "Test PR",
+        "headRepository": {
+            "name": "test-repo",
+            "owner": {"login": "test-user"},
+        },
+        "files": [{"path": "test.py"}],
+        "baseRefOid": "abc123",
+    }
+).encode()
+
+
+async def passing_verify(cmd, cwd):
+    return 0, b"", b""
+
 
 @pytest.fixture
-def temp_project_dir():
+def temp_project_dir(tmp_path_factory):
     """Create a temporary project directory with examples and evals folders."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        project_dir = Path(temp_dir) / "project"
-        examples_dir = project_dir / "examples"
-        evals_dir = project_dir / "evals"
+    project_dir = tmp_path_factory.mktemp("project")
+    examples_dir = project_dir / "examples"
+    evals_dir = project_dir / "evals"
 
-        examples_dir.mkdir(parents=True)
-        evals_dir.mkdir(parents=True)
+    examples_dir.mkdir(parents=True)
+    evals_dir.mkdir(parents=True)
 
-        old_file = examples_dir / "example.old.py"
-        new_file = examples_dir / "example.new.py"
+    old_file = examples_dir / "example.old.py"
+    new_file = examples_dir / "example.new.py"
 
-        with open(old_file, "w") as f:
-            f.write('def old_function():\n    print("This is the old version")\n')
+    old_file.write_text('def old_function():\n    print("This is the old version")\n')
 
-        with open(new_file, "w") as f:
-            f.write('def new_function():\n    print("This is the new version")\n')
+    new_file.write_text('def new_function():\n    print("This is the new version")\n')
 
-        system_prompt_file = project_dir / "system_prompt.md"
-        with open(system_prompt_file, "w") as f:
-            f.write("You are an expert at migrating code. Follow these patterns.")
+    system_prompt_file = project_dir / "system_prompt.md"
+    system_prompt_file.write_text(
+        "You are an expert at migrating code. Follow these patterns."
+    )
 
-        yield project_dir
+    return project_dir
 
 
 @pytest.fixture
-def temp_worktree():
+def temp_worktree(tmp_path_factory):
     """Create a temporary directory to simulate a git worktree."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        worktree_dir = Path(temp_dir) / "worktree"
-        worktree_dir.mkdir()
+    worktree_dir = tmp_path_factory.mktemp("worktree")
 
-        test_file = worktree_dir / "example.py"
-        with open(test_file, "w") as f:
-            f.write(
-                'def old_function():\n    print("This is the original version")\n    return "Old implementation"\n'
-            )
+    test_file = worktree_dir / "example.py"
+    test_file.write_text(
+        'def old_function():\n    print("This is the original version")\n    return "Old implementation"\n'
+    )
 
-        yield worktree_dir
+    return worktree_dir
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def fake_llm_client():
-    """Create a FakeLLMClient with test responses."""
+    """Create a FakeLLMClient with test responses.
+
+    There is a single canned response, so sharing the client (and its response
+    cycle) between tests does not change what any test sees.
+    """
     responses_dir = Path(__file__).parent / "test" / "eval_test_data"
     return FakeLLMClient(responses_dir)
 
@@ -76,21 +91,8 @@ async def test_eval_generation_with_flag(
 
     monkeypatch.setattr("ai_migrate.migrate.subprocess_run", mock_subprocess_run)
 
-    class MockProcess:
-        returncode = 0
-        stdout = None
-
-        async def communicate(self):
-            return b"", b""
-
-    async def mock_create_subprocess_exec(*args, **kwargs):
-        return MockProcess()
-
-    monkeypatch.setattr("asyncio.create_subprocess_exec", mock_create_subprocess_exec)
-
     target_file = temp_worktree / "example.py"
-    with open(target_file, "w") as f:
-        f.write('def original_function():\n    print("Original code")\n')
+    target_file.write_text('def original_function():\n    print("Original code")\n')
 
     verify_cmd = "echo success"
 
@@ -103,6 +105,7 @@ async def test_eval_generation_with_flag(
         worktree_root=temp_worktree,
         llm_fakes=None,
         dont_create_evals=True,
+        verify_runner=passing_verify,
     )
 
     evals_dir = temp_project_dir / "evals"
@@ -122,21 +125,8 @@ async def test_eval_generation_without_flag(
 
     monkeypatch.setattr("ai_migrate.migrate.subprocess_run", mock_subprocess_run)
 
-    class MockProcess:
-        returncode = 0
-        stdout = None
-
-        async def communicate(self):
-            return b"", b""
-
-    async def mock_create_subprocess_exec(*args, **kwargs):
-        return MockProcess()
-
-    monkeypatch.setattr("asyncio.create_subprocess_exec", mock_create_subprocess_exec)
-
     target_file = temp_worktree / "example.py"
-    with open(target_file, "w") as f:
-        f.write('def original_function():\n    print("Original code")\n')
+    target_file.write_text('def original_function():\n    print("Original code")\n')
 
     verify_cmd = "echo success"
 
@@ -149,6 +139,7 @@ async def test_eval_generation_without_flag(
         worktree_root=temp_worktree,
         llm_fakes=None,
         dont_create_evals=False,
+        verify_runner=passing_verify,
     )
 
     evals_dir = temp_project_dir / "evals"
@@ -156,22 +147,16 @@ async def test_eval_generation_without_flag(
     assert len(eval_dirs) == 1
 
     eval_dir = eval_dirs[0]
-    assert (eval_dir / "source").exists()
-    assert (eval_dir / "manifest.json").exists()
+    assert {"source", "manifest.json"} <= {p.name for p in eval_dir.iterdir()}
 
     source_files = list((eval_dir / "source").iterdir())
     assert len(source_files) == 1
     assert source_files[0].name == "example.py"
 
-    with open(source_files[0]) as f:
-        pass
-
-    with open(eval_dir / "manifest.json") as f:
-        manifest = json.load(f)
-
-        assert "files" in manifest
-        assert len(manifest["files"]) > 0
-        assert manifest["verify_cmd"] == verify_cmd
+    manifest = json.loads((eval_dir / "manifest.json").read_bytes())
+    assert "files" in manifest
+    assert len(manifest["files"]) > 0
+    assert manifest["verify_cmd"] == verify_cmd
 
 
 def test_generate_eval_from_migration():
@@ -197,16 +182,13 @@ def test_generate_eval_from_migration():
             project_dir, source_files, transformed_files, manifest
         )
 
-        assert eval_dir.exists()
-        assert (eval_dir / "source").exists()
-        assert (eval_dir / "manifest.json").exists()
+        assert {"source", "manifest.json"} <= {p.name for p in eval_dir.iterdir()}
 
         with open(eval_dir / "source" / "example.py") as f:
             content = f.read()
         assert content == source_files["example.py"]
 
-        with open(eval_dir / "manifest.json") as f:
-            saved_manifest = json.load(f)
+        saved_manifest = json.loads((eval_dir / "manifest.json").read_bytes())
 
         assert "files" in saved_manifest
         assert len(saved_manifest["files"]) == 1
@@ -233,17 +215,7 @@ async def test_generate_eval_from_pr_error_handling(monkeypatch):
                 else:
                     self.returncode = 0
                     if cmd[0] == "gh" and cmd[1] == "pr" and cmd[2] == "view":
-                        self._stdout = json.dumps(
-                            {
-                                "title": "Test PR",
-                                "headRepository": {
-                                    "name": "test-repo",
-                                    "owner": {"login": "test-user"},
-                                },
-                                "files": [{"path": "test.py"}],
-                                "baseRefOid": "abc123",
-                            }
-                        ).encode()
+                        self._stdout = _PR_VIEW_STDOUT
                     else:
                         self._stdout = b""
                     self._stderr = b""
@@ -264,6 +236,4 @@ async def test_generate_eval_from_pr_error_handling(monkeypatch):
         eval_dirs = list(evals_dir.iterdir())
         assert len(eval_dirs) > 0
         eval_dir = eval_dirs[0]
-        assert eval_dir.exists()
-        assert (eval_dir / "source").exists()
-        assert (eval_dir / "manifest.json").exists()
+        assert {"source", "manifest.json"} <= {p.name for p in eval_dir.iterdir()}
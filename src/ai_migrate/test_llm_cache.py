@@ -0,0 +1,105 @@
+import itertools
+import sqlite3
+import time
+
+from ai_migrate.llm_providers.cache import EmbeddingCache, ResponseCache
+
+
+def test_response_cache_round_trip(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    messages = [{"role": "user", "content": "Migrate this"}]
+    key = ResponseCache.key(model="gpt-4o", messages=messages, temperature=0.1)
+
+    assert cache.get(key) is None
+
+    response = {"choices": [{"message": {"content": "Done"}}]}
+    cache.put(key, response)
+    assert cache.get(key) == response
+
+    # The cache is persisted and shared between instances
+    assert ResponseCache(tmp_path / "cache.sqlite").get(key) == response
+
+
+def test_response_cache_key_is_exact():
+    messages = [{"role": "user", "content": "Migrate this"}]
+    key = ResponseCache.key(model="gpt-4o", messages=messages, temperature=0.1)
+
+    assert key == ResponseCache.key(temperature=0.1, messages=messages, model="gpt-4o")
+    assert key != ResponseCache.key(model="gpt-4o", messages=messages, temperature=0)
+    assert key != ResponseCache.key(
+        model="gpt-4o",
+        messages=[{"role": "user", "content": "Migrate that"}],
+        temperature=0.1,
+    )
+
+
+def test_response_cache_expires(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", ttl_seconds=-1)
+    key = ResponseCache.key(model="gpt-4o", messages=[], temperature=0.1)
+    cache.put(key, {"choices": []})
+
+    assert cache.get(key) is None
+
+
+def count_rows(cache: ResponseCache) -> int:
+    return cache._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+def test_response_cache_deletes_expired_rows(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = ResponseCache(path)
+    for text in ["a", "b"]:
+        cache.put(ResponseCache.key(messages=text), {"choices": []})
+    assert count_rows(cache) == 2
+
+    # Opening a cache purges expired rows, and so does every put
+    assert count_rows(ResponseCache(path, ttl_seconds=-1)) == 0
+
+    cache = ResponseCache(path, ttl_seconds=-1)
+    cache.put(ResponseCache.key(messages="c"), {"choices": []})
+    assert count_rows(cache) == 0
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count(1_000_000)
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_entries=2)
+    a, b, c = (ResponseCache.key(messages=text) for text in "abc")
+
+    cache.put(a, {"choices": ["a"]})
+    cache.put(b, {"choices": ["b"]})
+    assert cache.get(a) is not None
+    cache.put(c, {"choices": ["c"]})
+
+    assert count_rows(cache) == 2
+    assert cache.get(b) is None
+    assert cache.get(a) == {"choices": ["a"]}
+    assert cache.get(c) == {"choices": ["c"]}
+
+
+def test_response_cache_upgrades_tables_without_access_time(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    key = ResponseCache.key(messages="a")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE responses (key BLOB PRIMARY KEY, response BLOB, created_at INT)"
+        )
+        conn.execute(
+            "INSERT INTO responses VALUES (?, ?, ?)", (key, "{}", int(time.time()))
+        )
+
+    cache = ResponseCache(path)
+    assert cache.get(key) == {}
+    cache.put(ResponseCache.key(messages="b"), {})
+    assert count_rows(cache) == 2
+
+
+def test_embedding_cache_round_trip(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+    key = EmbeddingCache.key("text-embedding-3-small", "fun main() {}")
+
+    assert cache.get(key) is None
+
+    cache.put(key, [0.25, -0.5, 1.0])
+    assert cache.get(key) == [0.25, -0.5, 1.0]
+    assert cache.get(EmbeddingCache.key("other-model", "fun main() {}")) is None
@@ -104,6 +104,32 @@ def test_valid_manifest_groups():
     assert manifest.goose_config.max_retries == 3
 
 
+def test_group_names_are_stable():
+    # Group names are used for migrator branch and worktree names, so changing
+    # them orphans the branches of in-flight projects
+    assert FileGroup(files=["a/x.kt"]).group_name() == "a__x.kt"
+    assert FileGroup(files=["b/y.kt", "a/x.kt"]).group_name() == "b__y.kt-05bf8242"
+    assert Directory(dir="a/b").group_name() == "a__b-b5776589"
+
+
+def test_group_name_follows_changes():
+    group = FileGroup(files=["a/x.kt"])
+    assert group.group_name() == "a__x.kt"
+    group.files = ["b/y.kt", "a/x.kt"]
+    assert group.group_name() == "b__y.kt-05bf8242"
+
+    directory = Directory(dir="a/b")
+    assert directory.group_name() == "a__b-b5776589"
+    directory.glob = "**/*.kt"
+    assert directory.group_name() != "a__b-b5776589"
+
+
+def test_group_name_keeps_equality():
+    group = FileGroup(files=["a/x.kt", "b/y.kt"])
+    group.group_name()
+    assert group == FileGroup(files=["a/x.kt", "b/y.kt"])
+
+
 def test_normalize_files():
     """Test that Directory.to_file_group correctly converts Directory objects to FileGroup objects."""
 
@@ -1,3 +1,4 @@
+from operator import attrgetter
 from pathlib import Path
 
 import pytest
@@ -9,20 +10,25 @@ from ai_migrate.migrate import (
     CodeResponseResult,
     CodeBlock,
     MigrationExample,
+    max_examples_from_env,
     read_file_pairs_from,
+    select_relevant_examples,
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def examples_dir():
     return Path(__file__).parent / "test" / "examples"
 
 
-def test_read_file_pairs_from(examples_dir):
-    # Convert iterator to list for testing
-    examples = list(read_file_pairs_from(examples_dir))
+@pytest.fixture(scope="session")
+def examples(examples_dir) -> list[MigrationExample]:
+    """The parsed examples, shared by the session; tests must not mutate them."""
+    return list(read_file_pairs_from(examples_dir))
 
-    examples.sort(key=lambda x: x.name if x.name else "")
+
+def test_read_file_pairs_from(examples):
+    examples = sorted(examples, key=lambda x: x.name or "")
 
     # We expect 2 examples: one directory pair and one file pair
     assert len(examples) == 2
@@ -30,34 +36,34 @@ def test_read_file_pairs_from(examples_dir):
     dir_example = examples[0]
     assert dir_example.name == "example1"
 
-    dir_example.old_files.sort(key=lambda x: x.name)
-    dir_example.new_files.sort(key=lambda x: x.name)
+    old_files = sorted(dir_example.old_files, key=attrgetter("name"))
+    new_files = sorted(dir_example.new_files, key=attrgetter("name"))
 
-    assert len(dir_example.old_files) == 2
-    assert dir_example.old_files[0].name == "src/file1.py"
-    assert dir_example.old_files[1].name == "src/file2.py"
+    assert len(old_files) == 2
+    assert old_files[0].name == "src/file1.py"
+    assert old_files[1].name == "src/file2.py"
     assert (
-        dir_example.old_files[0].content
+        old_files[0].content
         == """def old_function():
     print("This is the old version of file1")\n"""
     )
     assert (
-        dir_example.old_files[1].content
+        old_files[1].content
         == """class OldClass:
     def method(self):
         return "old implementation"\n"""
     )
 
-    assert len(dir_example.new_files) == 2
-    assert dir_example.new_files[0].name == "src/file1.py"
-    assert dir_example.new_files[1].name == "src/file2.py"
+    assert len(new_files) == 2
+    assert new_files[0].name == "src/file1.py"
+    assert new_files[1].name == "src/file2.py"
     assert (
-        dir_example.new_files[0].content
+        new_files[0].content
         == """def new_function():
     print("This is the new version of file1")\n"""
     )
     assert (
-        dir_example.new_files[1].content
+        new_files[1].content
         == """class NewClass:
     def method(self):
         return "new implementation"\n"""
@@ -83,6 +89,31 @@ def test_read_file_pairs_from(examples_dir):
     )
 
 
+_EXAMPLES_EXPECTED = [
+    {
+        "role": "user",
+        "content": """Migrate this code to the new format:
+
+### `main.kt`
+```kotlin
+fun main() {
+    apiv1("Hello, world!")
+}
+```. Return the full content for all files mentioned, don't leave anything out. You can rename a file if necessary.""",
+    },
+    {
+        "role": "assistant",
+        "content": """Here's the migrated code:
+### `main.kt`
+```kotlin
+fun main() {
+    apiv2("Hello, world!")
+}
+```""",
+    },
+]
+
+
 def test_examples_prompt():
     example = MigrationExample(
         name="main",
@@ -108,10 +139,13 @@ fun main() {
         ],
     )
     messages = migrate_prompt(example)
-    assert messages == [
-        {
-            "role": "user",
-            "content": """Migrate this code to the new format:
+    assert messages == _EXAMPLES_EXPECTED
+
+
+_NO_NEW_CODE_EXPECTED = [
+    {
+        "role": "user",
+        "content": """Migrate this code to the new format:
 
 ### `main.kt`
 ```kotlin
@@ -119,18 +153,8 @@ fun main() {
     apiv1("Hello, world!")
 }
 ```. Return the full content for all files mentioned, don't leave anything out. You can rename a file if necessary.""",
-        },
-        {
-            "role": "assistant",
-            "content": """Here's the migrated code:
-### `main.kt`
-```kotlin
-fun main() {
-    apiv2("Hello, world!")
-}
-```""",
-        },
-    ]
+    }
+]
 
 
 def test_no_new_code_prompt():
@@ -149,19 +173,47 @@ fun main() {
         new_files=[],
     )
     messages = migrate_prompt(example)
-    assert messages == [
-        {
-            "role": "user",
-            "content": """Migrate this code to the new format:
+    assert messages == _NO_NEW_CODE_EXPECTED
+
+
+_MULTIFILE_EXPECTED = [
+    {
+        "role": "user",
+        "content": """Migrate this code to the new format:
 
 ### `main.kt`
 ```kotlin
 fun main() {
-    apiv1("Hello, world!")
+    hello("Hello, world!")
+}
+```
+
+### `hello.kt`
+```kotlin
+fun hello(message: String) {
+    println(message)
 }
 ```. Return the full content for all files mentioned, don't leave anything out. You can rename a file if necessary.""",
-        }
-    ]
+    },
+    {
+        "role": "assistant",
+        "content": """Here's the migrated code:
+### `main.kt`
+```kotlin
+fun main() {
+    hello("Hello, world!", "again!")
+}
+```
+
+### `hello.kt`
+```kotlin
+fun hello(message: String, message2: String) {
+    println(message)
+    println(message2)
+}
+```""",
+    },
+]
 
 
 def test_multifile_prompt():
@@ -206,44 +258,7 @@ fun hello(message: String, message2: String) {
         ],
     )
     messages = migrate_prompt(example)
-    assert messages == [
-        {
-            "role": "user",
-            "content": """Migrate this code to the new format:
-
-### `main.kt`
-```kotlin
-fun main() {
-    hello("Hello, world!")
-}
-```
-
-### `hello.kt`
-```kotlin
-fun hello(message: String) {
-    println(message)
-}
-```. Return the full content for all files mentioned, don't leave anything out. You can rename a file if necessary.""",
-        },
-        {
-            "role": "assistant",
-            "content": """Here's the migrated code:
-### `main.kt`
-```kotlin
-fun main() {
-    hello("Hello, world!", "again!")
-}
-```
-
-### `hello.kt`
-```kotlin
-fun hello(message: String, message2: String) {
-    println(message)
-    println(message2)
-}
-```""",
-        },
-    ]
+    assert messages == _MULTIFILE_EXPECTED
 
 
 def test_split_code_blocks():
@@ -266,3 +281,40 @@ uv run file1.py
         ],
         other_text="Here's some code:\n<code>\ntry it out. Some more:\n<code>",
     )
+
+
+@pytest.mark.asyncio
+async def test_select_relevant_examples():
+    class FakeEmbeddingClient:
+        async def embed(self, texts):
+            return [[text.count("apiv1"), text.count("print"), 1.0] for text in texts]
+
+    def example(name, content):
+        return MigrationExample(
+            name=name,
+            old_files=[FileContent(name=f"{name}.kt", content=content)],
+            new_files=[],
+        )
+
+    examples = [
+        example("logging", 'print("a")\nprint("b")'),
+        example("api", 'apiv1("a")\napiv1("b")'),
+        example("mixed", 'apiv1("a")\nprint("b")'),
+    ]
+    target = example(None, 'apiv1("Hello")\napiv1("world")')
+
+    selected = await select_relevant_examples(
+        FakeEmbeddingClient(), examples, target, 2
+    )
+    assert [e.name for e in selected] == ["api", "mixed"]
+
+
+@pytest.mark.parametrize(
+    "value, expected", [(None, 0), ("", 0), ("5", 5), ("abc", 0), ("-2", 0)]
+)
+def test_max_examples_from_env(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("AI_MIGRATE_MAX_EXAMPLES", raising=False)
+    else:
+        monkeypatch.setenv("AI_MIGRATE_MAX_EXAMPLES", value)
+    assert max_examples_from_env() == expected
@@ -0,0 +1,155 @@
+import asyncio
+from contextlib import aclosing
+from types import SimpleNamespace
+
+import pytest
+
+from ai_migrate.llm_providers import openai as openai_provider
+from ai_migrate.llm_providers.cache import EmbeddingCache
+from ai_migrate.llm_providers.openai import (
+    OpenAIClient,
+    _embedding_batches,
+    shared_openai_client,
+)
+
+
+class FakeEmbeddings:
+    """Embeds each text as [len(text)], failing any batch containing ``fail_on``."""
+
+    def __init__(self, fail_on: str | None = None):
+        self.fail_on = fail_on
+        self.calls = []
+
+    async def create(self, model, input):
+        self.calls.append(input)
+        if self.fail_on in input:
+            raise RuntimeError("request too large")
+        return SimpleNamespace(
+            data=[SimpleNamespace(embedding=[float(len(text))]) for text in input]
+        )
+
+
+class FakeStream:
+    """Stands in for the AsyncStream returned by a streaming completion."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.sent = 0
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+
+class FakeCompletions:
+    def __init__(self, stream: FakeStream):
+        self.stream = stream
+        self.kwargs = None
+
+    async def create(self, **kwargs):
+        self.kwargs = kwargs
+        return self.stream
+
+
+def chunk(*contents):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=c)) for c in contents]
+    )
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    # Count one token per character, so tests need no tiktoken encoding files
+    monkeypatch.setattr(
+        openai_provider, "_truncate_for_embedding", lambda text: (text, len(text))
+    )
+    client = OpenAIClient()
+    client.__dict__["_embedding_cache"] = EmbeddingCache(tmp_path / "cache.sqlite")
+    return client
+
+
+def test_embedding_batches_respect_token_and_size_limits(monkeypatch):
+    monkeypatch.setattr(openai_provider, "EMBEDDING_MAX_BATCH_TOKENS", 10)
+    monkeypatch.setattr(openai_provider, "EMBEDDING_BATCH_SIZE", 3)
+
+    assert _embedding_batches({0: 4, 1: 4, 2: 4, 3: 2}) == [[0, 1], [2, 3]]
+    assert _embedding_batches({0: 1, 1: 1, 2: 1, 3: 1}) == [[0, 1, 2], [3]]
+    # A text over the budget on its own still gets a batch
+    assert _embedding_batches({0: 12, 1: 1}) == [[0], [1]]
+
+
+@pytest.mark.asyncio
+async def test_embed_caches_successful_batches_when_one_fails(monkeypatch, client):
+    monkeypatch.setattr(openai_provider, "EMBEDDING_MAX_BATCH_TOKENS", 8)
+    client._openai_client = SimpleNamespace(embeddings=FakeEmbeddings(fail_on="bad"))
+
+    with pytest.raises(RuntimeError):
+        await client.embed(["aaaa", "bbbb", "bad"])
+
+    client._openai_client = SimpleNamespace(embeddings=FakeEmbeddings())
+    assert await client.embed(["aaaa", "bbbb", "ok"]) == [[4.0], [4.0], [2.0]]
+    # Only the text from the failed batch had to be embedded again
+    assert client._openai_client.embeddings.calls == [["ok"]]
+
+
+@pytest.mark.asyncio
+async def test_generate_completion_stream_skips_empty_chunks(client):
+    stream = FakeStream([chunk(), chunk("Hel"), chunk(None), chunk(""), chunk("lo")])
+    completions = FakeCompletions(stream)
+    client._openai_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=completions)
+    )
+
+    messages = [{"role": "user", "content": "Hi"}]
+    text = [c async for c in client.generate_completion_stream(messages)]
+
+    assert text == ["Hel", "lo"]
+    assert completions.kwargs["stream"] is True
+    assert completions.kwargs["messages"] == messages
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_generate_completion_stream_closes_on_early_exit(client):
+    stream = FakeStream([chunk("a"), chunk("b"), chunk("c")])
+    client._openai_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=FakeCompletions(stream))
+    )
+
+    async with aclosing(client.generate_completion_stream([])) as text:
+        async for content in text:
+            assert content == "a"
+            break
+
+    assert stream.closed
+    assert stream.sent == 1
+
+
+def test_shared_openai_client_is_closed_when_run_ends(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+    async def run():
+        async with shared_openai_client():
+            shared = OpenAIClient()._openai_client
+            assert OpenAIClient()._openai_client is shared
+
+            async def in_task():
+                return OpenAIClient()._openai_client
+
+            assert await asyncio.create_task(in_task()) is shared
+        assert OpenAIClient()._openai_client is not shared
+        return shared
+
+    first, second = asyncio.run(run()), asyncio.run(run())
+    # Each run gets its own pool, released when the run finishes
+    assert first is not second
+    assert first.is_closed() and second.is_closed()
@@ -0,0 +1,32 @@
+import time
+
+import pytest
+
+from ai_migrate.llm_providers.rate_limit import RateLimiter, rate_limiter_from_env
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_allows_burst_then_throttles():
+    limiter = RateLimiter(per_minute=600, burst=2)
+
+    start = time.monotonic()
+    await limiter.acquire()
+    await limiter.acquire()
+    assert time.monotonic() - start < 0.05
+
+    await limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.parametrize("rpm", ["abc", "0", "-5", "nan", "inf"])
+def test_rate_limiter_from_env_rejects_invalid_values(monkeypatch, rpm):
+    monkeypatch.setenv("AI_MIGRATE_LLM_RPM", rpm)
+    with pytest.raises(ValueError, match="AI_MIGRATE_LLM_RPM"):
+        rate_limiter_from_env()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_rejects_requests_over_capacity():
+    limiter = RateLimiter(per_minute=60, burst=2)
+    with pytest.raises(ValueError):
+        await limiter.acquire(3)